@@ -1,77 +1,165 @@
+import atexit                # For closing the shared database connection on exit
+import os                    # For checking the interactive-plot override
 import sqlite3               # For working with SQLite database
+import sys                   # For command-line script mode
 from datetime import datetime  # For validating dates
+
+import matplotlib
+# Default to the Agg rasterizer: charts are saved to a PNG without paying
+# for GUI toolkit startup. Set EXPENSE_TRACKER_INTERACTIVE=1 to get the
+# old pop-up window behaviour instead.
+_INTERACTIVE = os.environ.get("EXPENSE_TRACKER_INTERACTIVE") == "1"
+if not _INTERACTIVE:
+    matplotlib.use("Agg")
 import matplotlib.pyplot as plt  # For plotting expense graphs
+import numpy as np           # For vectorized chart data preparation
+
+# Shared database connection, created once in create_table() and reused by
+# every function below. Reusing one connection keeps SQLite's page cache and
+# prepared-statement cache warm instead of rebuilding them on every call.
+_CONN = None
+
+# SQL statements used by the functions below, built once at import so the
+# same string objects hit the connection's statement cache on every call.
+_SQL_INSERT = "INSERT INTO expenses (date, category, description, amount) VALUES (?, ?, ?, ?)"
+_SQL_DELETE = "DELETE FROM expenses WHERE id=?"
+_SQL_UPDATE = "UPDATE expenses SET date=?, category=?, description=?, amount=? WHERE id=?"
+_SQL_VIEW   = ("SELECT id, date, category, description, amount/100.0"
+               "  FROM expenses ORDER BY date")  # Ordering is served by idx_expenses_date
+_SQL_TOTAL  = "SELECT total(amount)/100.0 FROM expenses"
+_SQL_MONTH  = "SELECT total(amount)/100.0 FROM expenses WHERE date >= ? AND date < ?"
+_SQL_CATS   = """SELECT category, SUM(amount)/100.0 AS total,
+                        SUM(amount) > 3000000 AS over
+                   FROM expenses GROUP BY category ORDER BY total DESC"""
+
+def _to_cents(amount):
+    """Convert a currency amount to the integer cents stored in the table."""
+    return int(round(amount * 100))
 
 # ---------- DATABASE SETUP ----------
 def create_table():
     """
-    Create the 'expenses' table if it does not already exist.
+    Open the shared database connection and create the 'expenses' table
+    if it does not already exist.
     Columns:
         id          -> unique auto-incremented ID
         date        -> expense date
         category    -> expense category (Food, Travel, etc.)
         description -> details about the expense
-        amount      -> amount spent
+        amount      -> amount spent, stored as integer cents so sums
+                       are exact integer math with no float rounding
     """
-    conn = sqlite3.connect("expenses.db")  # Connect to the database (creates file if not found)
-    cursor = conn.cursor()  # Cursor is used to execute SQL commands
+    global _CONN
+    if _CONN is not None:  # Already connected, nothing to do
+        return
+    # Connect once for the life of the program (creates file if not found)
+    _CONN = sqlite3.connect("expenses.db", check_same_thread=False,
+                            cached_statements=128)
+    atexit.register(_CONN.close)  # Make sure the connection closes on exit
+    cursor = _CONN.cursor()  # Cursor is used to execute SQL commands
+    # Tune SQLite for this connection: WAL journaling with relaxed sync
+    # cuts the fsync cost of every INSERT/UPDATE/DELETE commit, and the
+    # remaining settings keep temporary data and hot pages in memory.
+    cursor.execute("PRAGMA journal_mode=WAL;")     # Write-ahead log journaling
+    cursor.execute("PRAGMA synchronous=NORMAL;")   # Safe with WAL, far fewer fsyncs
+    cursor.execute("PRAGMA temp_store=MEMORY;")    # Keep temp tables/indices in RAM
+    cursor.execute("PRAGMA cache_size=-64000;")    # 64MB page cache
+    cursor.execute("PRAGMA mmap_size=268435456;")  # Memory-map up to 256MB of the file
     cursor.execute('''CREATE TABLE IF NOT EXISTS expenses (
                         id INTEGER PRIMARY KEY AUTOINCREMENT,
                         date TEXT,
                         category TEXT,
                         description TEXT,
-                        amount REAL)''')  # SQL to create table if it doesn't exist
-    conn.commit()  # Save changes
-    conn.close()   # Close database connection
+                        amount INTEGER)''')  # SQL to create table if it doesn't exist
+    # One-time migration for databases created when amount was REAL
+    # currency units: rescale the stored values to integer cents, guarded
+    # by user_version so the rescale can never run twice. (The old column
+    # keeps REAL affinity, but whole-cent values stay exact.)
+    (version,) = cursor.execute("PRAGMA user_version").fetchone()
+    if version < 1:
+        row = cursor.execute(
+            "SELECT type FROM pragma_table_info('expenses') WHERE name='amount'").fetchone()
+        if row and row[0] == "REAL":
+            cursor.execute("UPDATE expenses SET amount = CAST(round(amount*100) AS INTEGER)")
+        cursor.execute("PRAGMA user_version=1")
+    # Index on date so monthly range queries become B-tree lookups
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses(date)")
+    # Covering index so the category chart's GROUP BY streams straight
+    # off the index instead of scanning and sorting the table
+    cursor.execute("CREATE INDEX IF NOT EXISTS idx_expenses_cat_amt ON expenses(category, amount)")
+    _CONN.commit()  # Save changes
+
+# ---------- MONTH ARITHMETIC ----------
+def _next_month(month):
+    """
+    Return the first day of the month after 'month' (YYYY-MM) as YYYY-MM-DD.
+    Used to turn 'all dates in a month' into an index-friendly range.
+    """
+    year, mon = map(int, month.split("-"))
+    if mon == 12:  # December rolls over to January of the next year
+        year, mon = year + 1, 1
+    else:
+        mon += 1
+    return f"{year:04d}-{mon:02d}-01"
 
 # ---------- ADD EXPENSE ----------
 def add_expense(date, category, description, amount):
     """
     Add a new expense record into the expenses table.
     """
-    conn = sqlite3.connect("expenses.db")
-    cursor = conn.cursor()
-    # Insert a new expense row into the table
-    cursor.execute("INSERT INTO expenses (date, category, description, amount) VALUES (?, ?, ?, ?)",
-                   (date, category, description, amount))
-    conn.commit()
-    conn.close()
+    # 'with _CONN:' commits on success and rolls back on error;
+    # Connection.execute skips the explicit cursor round-trip
+    with _CONN:
+        _CONN.execute(_SQL_INSERT, (date, category, description, _to_cents(amount)))
+
+# ---------- ADD MANY EXPENSES ----------
+def add_expenses_many(rows):
+    """
+    Insert many expense records in one go.
+    'rows' is an iterable of (date, category, description, amount) tuples.
+    All rows share a single transaction (one commit/fsync) and the INSERT
+    statement is prepared once and reused, so bulk loads such as CSV
+    imports run far faster than calling add_expense() per row.
+    """
+    with _CONN:  # One BEGIN/COMMIT around the whole batch
+        _CONN.executemany(_SQL_INSERT,
+                          ((date, category, description, _to_cents(amount))
+                           for date, category, description, amount in rows))
 
 # ---------- VIEW EXPENSES ----------
+# Row template bound once at import; reusing the bound .format method
+# avoids re-parsing the format spec for every row printed
+_ROW_FMT = "{:<5}{:<12}{:<15}{:<20}{:<10.2f}\n".format
+
 def view_expenses():
     """
     Display all expenses stored in the database in a table format.
     """
-    conn = sqlite3.connect("expenses.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT * FROM expenses")  # Fetch all rows
-    rows = cursor.fetchall()
-    conn.close()
+    cursor = _CONN.execute(_SQL_VIEW)
 
-    # If no records found
-    if not rows:
+    # Fetch the first row to check whether there are any records at all
+    first = cursor.fetchone()
+    if first is None:
         print("No expenses recorded.")
-    else:
-        # Print table headers
-        print(f"{'ID':<5}{'Date':<12}{'Category':<15}{'Description':<20}{'Amount':<10}")
-        print("-"*65)
-        # Print each row neatly
-        for row in rows:
-            print(f"{row[0]:<5}{row[1]:<12}{row[2]:<15}{row[3]:<20}{row[4]:<10.2f}")
+        return
+
+    # Print table headers
+    print(f"{'ID':<5}{'Date':<12}{'Category':<15}{'Description':<20}{'Amount':<10}")
+    print("-"*65)
+    # Stream the cursor straight into stdout: formatting uses the bound
+    # template and writelines batches the writes, with memory staying
+    # bounded because rows are never collected into a list
+    sys.stdout.write(_ROW_FMT(*first))
+    sys.stdout.writelines(_ROW_FMT(*row) for row in cursor)
 
 # ---------- SHOW TOTAL EXPENSE ----------
 def total_expense():
     """
     Calculate and display the total of all expenses.
     """
-    conn = sqlite3.connect("expenses.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT SUM(amount) FROM expenses")  # Add up all amounts
-    total = cursor.fetchone()[0]
-    conn.close()
-
-    # If total is None (no expenses yet), set to 0
-    value = total if total else 0
+    # total() coalesces the empty-table case to 0.0 in SQL, so the single
+    # result row unpacks straight into the value
+    (value,) = _CONN.execute(_SQL_TOTAL).fetchone()
     print(f"Total expense: {value:.2f}")
 
 # ---------- DELETE EXPENSE ----------
@@ -79,23 +167,16 @@ def delete_expense(id):
     """
     Delete a specific expense from the database by ID.
     """
-    conn = sqlite3.connect("expenses.db")
-    cursor = conn.cursor()
-    cursor.execute("DELETE FROM expenses WHERE id=?", (id,))
-    conn.commit()
-    conn.close()
+    with _CONN:  # Commit on success, roll back on error
+        _CONN.execute(_SQL_DELETE, (id,))
 
 # ---------- UPDATE EXPENSE ----------
 def update_expense(id, date, category, description, amount):
     """
     Update an existing expense record with new details.
     """
-    conn = sqlite3.connect("expenses.db")
-    cursor = conn.cursor()
-    cursor.execute("UPDATE expenses SET date=?, category=?, description=?, amount=? WHERE id=?",
-                   (date, category, description, amount, id))
-    conn.commit()
-    conn.close()
+    with _CONN:  # Commit on success, roll back on error
+        _CONN.execute(_SQL_UPDATE, (date, category, description, _to_cents(amount), id))
 
 # ---------- VALIDATE DATE ----------
 def get_valid_date():
@@ -105,81 +186,164 @@ def get_valid_date():
     """
     while True:
         raw = input("Enter date (YYYY-MM-DD): ").strip()
-
-        # Check for proper format: length 10 and hyphens in correct positions
-        if len(raw) != 10 or raw[4] != '-' or raw[7] != '-':
-            print("Invalid format! Use YYYY-MM-DD with dashes.")
-            continue
-
         try:
-            # Try converting to datetime to ensure validity
-            valid_date = datetime.strptime(raw, "%Y-%m-%d")
-            return valid_date.strftime("%Y-%m-%d")
+            # strptime validates both the format and the calendar date
+            return datetime.strptime(raw, "%Y-%m-%d").strftime("%Y-%m-%d")
         except ValueError:
             print("Invalid date! Please enter a valid date (e.g., 2025-08-03)")
 
 # ---------- MONTHLY EXPENSE ----------
-def monthly_expense():
+def monthly_expense(month=None):
     """
-    Show total expenses for a particular month.
-    User inputs month as YYYY-MM.
+    Show total expenses for a particular month (YYYY-MM).
+    Prompts for the month when none is given, so scripts can pass it directly.
     """
-    month = input("Enter month in YYYY-MM format: ").strip()
+    if month is None:
+        month = input("Enter month in YYYY-MM format: ").strip()
 
-    conn = sqlite3.connect("expenses.db")
-    cursor = conn.cursor()
-    # Get sum of all expenses where date starts with the given month
-    cursor.execute("SELECT SUM(amount) FROM expenses WHERE substr(date,1,7)=?", (month,))
-    total = cursor.fetchone()[0]
-    conn.close()
+    try:
+        # strptime validates the month before it is used to build the range
+        datetime.strptime(month, "%Y-%m")
+    except ValueError:
+        print("Invalid month! Please enter a valid month (e.g., 2025-08)")
+        return
 
-    value = total if total else 0
+    # Sum all expenses inside the month using a date range, so the
+    # idx_expenses_date index is used instead of scanning every row;
+    # total() returns 0.0 for a month with no expenses
+    (value,) = _CONN.execute(_SQL_MONTH,
+                             (f"{month}-01", _next_month(month))).fetchone()
     print(f"Total expense for {month}: {value:.2f}")
 
 # ---------- PLOT CATEGORY EXPENSES ----------
+# Figure and axes are created once and reused across plot calls; building
+# them is the most expensive part of each Matplotlib draw. The bar patches
+# and the categories they were drawn for are cached too, so a redraw with
+# the same categories just mutates the existing rectangles in place.
+_FIG, _AX = None, None
+_BARS, _BAR_CATS = None, None
+
 def plot_category_expenses():
     """
     Display a bar graph showing total spending per category.
     Bars above 30000 are shown in red to indicate overspending.
     """
-    conn = sqlite3.connect("expenses.db")
-    cursor = conn.cursor()
-    cursor.execute("SELECT category, SUM(amount) FROM expenses GROUP BY category")
+    global _FIG, _AX, _BARS, _BAR_CATS
+    cursor = _CONN.cursor()
+    # Let SQLite compute the overspend flag and sort descending by total,
+    # so the client receives chart-ready rows
+    cursor.execute(_SQL_CATS)
     rows = cursor.fetchall()
-    conn.close()
 
     # If no data available
     if not rows:
         print("No expenses to display.")
         return
 
-    # Separate data into lists
-    categories = [row[0] for row in rows]
-    amounts = [row[1] for row in rows]
+    # Split rows into a category list, a NumPy amount array, and overspend flags
+    categories, amounts, over = zip(*rows)
+    amounts = np.asarray(amounts, dtype=np.float32)
+
+    # Colors come straight from the SQL-computed flag: red means overspent
+    colors = np.where(np.asarray(over, dtype=bool), 'red', 'skyblue')
 
-    # Assign colors: red if over 30000, skyblue otherwise
-    colors = ['red' if amt > 30000 else 'skyblue' for amt in amounts]
+    # Create the figure once, then reuse it on later calls. In interactive
+    # mode closing the chart window destroys the figure, so check it is
+    # still registered with pyplot and rebuild (bars included) if not.
+    if _FIG is None or not plt.fignum_exists(_FIG.number):
+        _FIG, _AX = plt.subplots(figsize=(8, 3))
+        _BARS, _BAR_CATS = None, None
 
-    # Create a bar chart
-    plt.figure(figsize=(8, 3))  # Set figure size
-    plt.bar(categories, amounts, color=colors)  # Use colors based on amounts
-    plt.xlabel("Category")   # Label for X-axis
-    plt.ylabel("Total Expense")  # Label for Y-axis
-    plt.title("Expenses by Category")  # Title of the graph
-    plt.xticks(rotation=45)  # Rotate X-axis labels for better visibility
+    if _BARS is not None and _BAR_CATS == categories:
+        # Same categories as last draw: update the existing Rectangle
+        # patches in place instead of recreating every artist
+        for rect, height, color in zip(_BARS, amounts, colors):
+            rect.set_height(height)
+            rect.set_facecolor(color)
+        _AX.relim()
+        _AX.autoscale_view(scaley=False)  # Y-range stays fixed below
+    else:
+        # Categories changed (or first draw): rebuild the chart
+        _AX.clear()
+        _BARS = _AX.bar(categories, amounts, color=colors)  # Use colors based on amounts
+        _BAR_CATS = categories
+        _AX.set_xlabel("Category")   # Label for X-axis
+        _AX.set_ylabel("Total Expense")  # Label for Y-axis
+        _AX.set_title("Expenses by Category")  # Title of the graph
+        _AX.tick_params(axis='x', rotation=45)  # Rotate X-axis labels for better visibility
 
-    # Set Y-axis range
-    plt.ylim(1000, 90000)   # Set minimum to 1000 and maximum to 90000
+        # Set Y-axis range
+        _AX.set_ylim(1000, 90000)   # Set minimum to 1000 and maximum to 90000
 
-    # Add a red horizontal line at y=30000
-    plt.axhline(30000, color='red', linestyle='--', linewidth=2, label='Limit (30000)')
-    plt.legend()
+        # Add a red horizontal line at y=30000
+        _AX.axhline(30000, color='red', linestyle='--', linewidth=2, label='Limit (30000)')
+        _AX.legend()
 
-    plt.tight_layout()  # Adjust layout to prevent clipping
-    plt.show()  # Display the graph
+        _FIG.tight_layout()  # Adjust layout to prevent clipping
+    _FIG.canvas.draw_idle()  # Redraw the reused canvas
+    if _INTERACTIVE:
+        plt.show()  # Display the graph in a window
+    else:
+        _FIG.savefig("chart.png")  # Rasterize straight to disk, no GUI needed
+        print("Chart saved to chart.png")
 
 
 
+# ---------- SCRIPTED COMMANDS ----------
+def dispatch(parts):
+    """
+    Execute one scripted command, already split into tokens:
+        add <date> <category> <description> <amount>
+        delete <id>
+        update <id> <date> <category> <description> <amount>
+        view | total | month <YYYY-MM> | graph
+    Mutations run on the shared connection without committing, so
+    run_script() can wrap a whole script in a single transaction.
+    """
+    cmd = parts[0].lower()
+    if cmd == "add":
+        _CONN.execute(_SQL_INSERT,
+                      (parts[1], parts[2], parts[3], _to_cents(float(parts[4]))))
+    elif cmd == "delete":
+        _CONN.execute(_SQL_DELETE, (int(parts[1]),))
+    elif cmd == "update":
+        _CONN.execute(_SQL_UPDATE,
+                      (parts[2], parts[3], parts[4], _to_cents(float(parts[5])), int(parts[1])))
+    elif cmd == "view":
+        view_expenses()
+    elif cmd == "total":
+        total_expense()
+    elif cmd == "month":
+        monthly_expense(parts[1])
+    elif cmd == "graph":
+        plot_category_expenses()
+    else:
+        print(f"Unknown command: {parts[0]}")
+
+def run_script(path):
+    """
+    Run commands from a file, one per line (blank lines and '#' comments
+    are skipped). The whole script executes inside one transaction, so
+    hundreds of mutations share a single commit, and consecutive 'add'
+    lines are grouped into one executemany batch insert.
+    """
+    with open(path) as script, _CONN:
+        batch = []  # Consecutive 'add' rows collected for one bulk insert
+        for line in script:
+            parts = line.split()
+            if not parts or parts[0].startswith("#"):
+                continue
+            if parts[0].lower() == "add":
+                batch.append((parts[1], parts[2], parts[3], _to_cents(float(parts[4]))))
+                continue
+            # A non-add command: flush any pending adds first to keep order
+            if batch:
+                _CONN.executemany(_SQL_INSERT, batch)
+                batch = []
+            dispatch(parts)
+        if batch:  # Flush adds left at the end of the script
+            _CONN.executemany(_SQL_INSERT, batch)
+
 # ---------- MAIN MENU ----------
 def menu():
     """
@@ -235,4 +399,9 @@ def menu():
 
 # ---------- RUN ----------
 if __name__ == "__main__":
-    menu()
+    if len(sys.argv) > 1:
+        # Script mode: run the commands in the given file without prompts
+        create_table()
+        run_script(sys.argv[1])
+    else:
+        menu()